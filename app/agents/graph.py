@@ -26,28 +26,31 @@ class AgentState(TypedDict, total=False):
     tool_actions: list
 
 
-def answer_node(state: AgentState) -> AgentState:
+async def answer_node(state: AgentState) -> AgentState:
     user_message = state["user_message"]
     business_id = state["business_id"]
     ctx = state["business_context"]
 
-    result = generate_answer(
+    result = await generate_answer(
         business_id=business_id,
         user_message=user_message,
         metadata_context=ctx,
     )
 
-    state["response"] = result.get("reply", "").strip()
-    state["documents_used"] = result.get("documents_used", 0)
-    state["tool_actions"] = []  # tools triggered only via appointments API now
+    documents_used = result.get("documents_used", 0)
 
-    logger.info(
+    logger.debug(
         "agent.answer_completed",
         business_id=business_id,
-        documents_used=state["documents_used"],
+        documents_used=documents_used,
     )
 
-    return state
+    # Return only the keys this node writes; LangGraph merges them into the state.
+    return {
+        "response": result.get("reply", "").strip(),
+        "documents_used": documents_used,
+        "tool_actions": [],  # tools triggered only via appointments API now
+    }
 
 
 graph = StateGraph(AgentState)
@@ -57,10 +60,10 @@ graph.add_edge("answer", END)
 agent_graph = graph.compile()
 
 
-def run_agent(*, business_id: int, user_message: str, business_context: Dict[str, Any]):
+async def run_agent(*, business_id: int, user_message: str, business_context: Dict[str, Any]):
     initial: AgentState = {
         "business_id": business_id,
         "user_message": user_message,
         "business_context": business_context,
     }
-    return agent_graph.invoke(initial)
+    return await agent_graph.ainvoke(initial)
@@ -1,2 +1,7 @@
 # Agent Nodes Package
+from types import MappingProxyType
+from typing import Any, Mapping
 
+# Shared read-only default for a missing context / metadata dict, instead of a
+# fresh {} per call.
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
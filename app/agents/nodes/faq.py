@@ -1,13 +1,35 @@
 """
 FAQ node for answering simple frequently asked questions.
 """
-from typing import Dict, Any
+import re
+import string
+from typing import Dict, Any, Mapping
 import structlog
 
+from app.agents.nodes import EMPTY_MAPPING
+
 logger = structlog.get_logger(__name__)
 
 
-def answer_faq(user_message: str, business_context: Dict[str, Any]) -> str:
+# Deletes punctuation so "hours?" tokenizes as "hours".
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation + "‘’“”…")
+
+# Single-word FAQ keywords, matched against whole words of the message.
+_FAQ_WORD_TOPICS = {
+    "services": "services",
+    "hours": "hours",
+    "open": "hours",
+    "closed": "hours",
+    "contact": "contact",
+    "phone": "contact",
+    "email": "contact",
+}
+
+# Multi-word FAQ keywords, tagged by topic.
+_FAQ_PHRASES_RE = re.compile(r"(?P<about>what is|who are)|(?P<services>what do)")
+
+
+def answer_faq(user_message: str, business_context: Mapping[str, Any]) -> str:
     """
     Answer simple FAQ questions based on business context.
     
@@ -18,25 +40,28 @@ def answer_faq(user_message: str, business_context: Dict[str, Any]) -> str:
     Returns:
         Answer to the FAQ
     """
-    message_lower = user_message.lower()
+    message_lower = user_message.lower().translate(_PUNCT_TABLE)
     business_name = business_context.get("name", "we")
     services = business_context.get("services", [])
     working_hours = business_context.get("working_hours", {})
     contact_email = business_context.get("contact_email", "")
     contact_phone = business_context.get("contact_phone", "")
+    tokens = message_lower.split()
+    topics = {_FAQ_WORD_TOPICS[word] for word in _FAQ_WORD_TOPICS.keys() & tokens}
+    topics.update(match.lastgroup for match in _FAQ_PHRASES_RE.finditer(message_lower))
     
     # Handle different FAQ types
-    if "what is" in message_lower or "who are" in message_lower:
+    if "about" in topics:
         description = business_context.get("description", f"{business_name} is a business.")
         return f"{business_name} is {description}"
     
-    if "services" in message_lower or "what do" in message_lower:
+    if "services" in topics:
         if services:
             services_list = ", ".join(services)
             return f"{business_name} offers the following services: {services_list}."
         return f"Please contact {business_name} for information about our services."
     
-    if "hours" in message_lower or "open" in message_lower or "closed" in message_lower:
+    if "hours" in topics:
         if working_hours:
             hours_text = []
             for day, times in working_hours.items():
@@ -45,7 +70,7 @@ def answer_faq(user_message: str, business_context: Dict[str, Any]) -> str:
             return f"{business_name} is open:\n" + "\n".join(hours_text)
         return f"Please contact {business_name} for our business hours."
     
-    if "contact" in message_lower or "phone" in message_lower or "email" in message_lower:
+    if "contact" in topics:
         contact_info = []
         if contact_phone:
             contact_info.append(f"Phone: {contact_phone}")
@@ -70,14 +95,14 @@ def faq_node(state: Dict[str, Any]) -> Dict[str, Any]:
         Updated state with FAQ answer
     """
     user_message = state.get("user_message", "")
-    business_context = state.get("business_context", {})
+    business_context = state.get("business_context") or EMPTY_MAPPING
     
     answer = answer_faq(user_message, business_context)
     
     state["response"] = answer
     state["next_node"] = "end"
     
-    logger.info("FAQ answered", question_length=len(user_message))
+    logger.debug("FAQ answered", question_length=len(user_message))
     
     return state
 
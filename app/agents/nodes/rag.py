@@ -7,10 +7,15 @@ Resilient RAG node for BizGenie (NO external LLM).
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import structlog
 
+from app.agents.nodes import EMPTY_MAPPING
+from app.rag.semantic_cache import semantic_cache
 from app.rag.vectorstore import vector_store
 
 logger = structlog.get_logger(__name__)
@@ -18,24 +23,53 @@ logger = structlog.get_logger(__name__)
 
 def _format_documents(documents: List[Dict[str, Any]], limit: int = 3) -> str:
     formatted: List[str] = []
-    for idx, doc in enumerate(documents[:limit], start=1):
-        text = (doc.get("text") or "").strip()
+    for idx, doc in enumerate(islice(documents, limit), start=1):
+        text = doc.get("text")
         if not text:
             continue
-        meta = doc.get("metadata") or {}
+        text = text.strip()
+        if not text:
+            continue
+        meta = doc.get("metadata") or EMPTY_MAPPING
         src = meta.get("filename") or meta.get("source") or "Document"
         formatted.append(f"[{idx}] From {src}:\n{text}")
     return "\n\n".join(formatted)
 
 
-def _fallback_from_metadata(user_message: str, meta: Dict[str, Any]) -> str:
-    name = meta.get("name") or "this business"
-    description = meta.get("description") or ""
-    services = meta.get("services") or []
-    hours = meta.get("working_hours") or {}
-    contact_email = meta.get("contact_email") or ""
-    contact_phone = meta.get("contact_phone") or ""
+_FALLBACK_FIELDS = (
+    "name",
+    "description",
+    "services",
+    "working_hours",
+    "contact_email",
+    "contact_phone",
+)
+
+
+def _hours_key(hours: Any) -> Optional[Tuple[Tuple[str, str, str], ...]]:
+    """Hashable view of working_hours: only days with both open and close times."""
+    if not hours:
+        return None
+    return tuple(
+        (d, info["open"], info["close"])
+        for d, info in hours.items()
+        if info and info.get("open") and info.get("close")
+    )
 
+
+@lru_cache(maxsize=1024)
+def _fallback_intro(
+    name: str,
+    description: Optional[str],
+    services: Any,
+    hours: Optional[Tuple[Tuple[str, str, str], ...]],
+    contact_email: Optional[str],
+    contact_phone: Optional[str],
+) -> str:
+    """
+    Metadata part of the fallback answer. Keyed on the metadata values
+    themselves, so edits to a business simply produce a new cache entry.
+    """
     parts: List[str] = []
 
     parts.append(f"Thanks for your message! Here's what I can tell you about {name} right now:")
@@ -44,17 +78,16 @@ def _fallback_from_metadata(user_message: str, meta: Dict[str, Any]) -> str:
         parts.append(f"\n• About us: {description}")
 
     if services:
-        if isinstance(services, list):
+        if isinstance(services, tuple):
             s = ", ".join(services)
         else:
             s = str(services)
         parts.append(f"\n• Services we offer: {s}")
 
-    if hours:
+    if hours is not None:
         parts.append("\n• Working hours:")
-        for d, info in hours.items():
-            if info and info.get("open") and info.get("close"):
-                parts.append(f"  - {d.capitalize()}: {info['open']} – {info['close']}")
+        for d, open_, close in hours:
+            parts.append(f"  - {d.capitalize()}: {open_} – {close}")
 
     if contact_email or contact_phone:
         parts.append("\n• You can contact us at:")
@@ -63,15 +96,33 @@ def _fallback_from_metadata(user_message: str, meta: Dict[str, Any]) -> str:
         if contact_phone:
             parts.append(f"  - Phone/WhatsApp: {contact_phone}")
 
-    parts.append(
+    return "\n".join(parts)
+
+
+def _fallback_from_metadata(user_message: str, meta: Mapping[str, Any]) -> str:
+    name, description, services, hours, contact_email, contact_phone = map(
+        meta.get, _FALLBACK_FIELDS
+    )
+    if isinstance(services, list):
+        services = tuple(services)
+
+    intro = _fallback_intro(
+        name or "this business",
+        description,
+        services,
+        _hours_key(hours),
+        contact_email,
+        contact_phone,
+    )
+
+    return (
+        f"{intro}\n"
         f"\nYou asked: “{user_message}”. "
         f"If you want, you can ask about services, pricing, or booking an appointment."
     )
 
-    return "\n".join(parts)
-
 
-def _build_answer_from_docs(user_message: str, meta: Dict[str, Any], documents: List[Dict[str, Any]]) -> str:
+def _build_answer_from_docs(user_message: str, meta: Mapping[str, Any], documents: List[Dict[str, Any]]) -> str:
     name = meta.get("name") or "this business"
     docs_block = _format_documents(documents)
 
@@ -85,7 +136,39 @@ def _build_answer_from_docs(user_message: str, meta: Dict[str, Any], documents:
     )
 
 
-def generate_answer(
+def _retrieve(business_id: int, user_message: str, n_results: int) -> List[Dict[str, Any]]:
+    """Embed the question and fetch documents (blocking; run in a worker thread)."""
+    # Near-duplicate questions are served from the semantic cache
+    query_embedding = vector_store.embed_query(user_message)
+    cached = (
+        semantic_cache.get(business_id, query_embedding, n_results)
+        if query_embedding is not None
+        else None
+    )
+    if cached is not None:
+        documents = cached
+    else:
+        documents = vector_store.query_documents(
+            business_id=business_id,
+            query=user_message,
+            n_results=n_results,
+            query_embedding=query_embedding,
+        )
+        # Empty results aren't cached: the store reports query failures as [],
+        # and a transient error shouldn't pin "no documents" for the whole TTL
+        if query_embedding is not None and documents:
+            semantic_cache.put(business_id, query_embedding, n_results, documents)
+    # Per-request event: debug level, and never the raw question (PII)
+    logger.debug(
+        "rag.query_completed",
+        business_id=business_id,
+        results=len(documents),
+        cache_hit=cached is not None,
+    )
+    return documents
+
+
+async def generate_answer(
     *,
     business_id: int,
     user_message: str,
@@ -93,22 +176,12 @@ def generate_answer(
     metadata_context: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
 
-    meta: Dict[str, Any] = metadata_context or {}
+    meta: Mapping[str, Any] = metadata_context or EMPTY_MAPPING
     documents: List[Dict[str, Any]] = []
 
-    # Vector store query
+    # Vector store query (embedding + ANN search are blocking, keep them off the loop)
     try:
-        documents = vector_store.query_documents(
-            business_id=business_id,
-            query=user_message,
-            n_results=n_results,
-        )
-        logger.info(
-            "rag.query_completed",
-            business_id=business_id,
-            results=len(documents),
-            query=user_message,
-        )
+        documents = await asyncio.to_thread(_retrieve, business_id, user_message, n_results)
     except Exception as exc:
         logger.error("rag.vectorstore_failed", error=str(exc))
         documents = []
@@ -13,14 +13,65 @@ Then `tool_router` in `graph.py` actually performs the async work.
 """
 from __future__ import annotations
 
-from typing import Dict, Any, Optional
-import json
+from typing import Dict, Any, Mapping, Optional
+import re
+
+import orjson
 import structlog
 
+from app.agents.nodes import EMPTY_MAPPING
+
 logger = structlog.get_logger(__name__)
 
 
-def extract_tool_requirements(user_message: str, business_context: Dict[str, Any]) -> Dict[str, Any]:
+# One case-insensitive pass tags every keyword occurrence. The lookahead lets
+# overlapping keywords match, so this keeps plain substring semantics
+# ("email" also covers "mail", "confirmation" covers "confirm").
+_TOOL_KEYWORDS_RE = re.compile(
+    r"(?=(?P<whatsapp>whatsapp|message|text)"
+    r"|(?P<email>mail)"
+    r"|(?P<appointment>appointment)"
+    r"|(?P<confirm>confirm|invite))",
+    re.IGNORECASE,
+)
+
+
+def _whatsapp_params(ctx: Mapping[str, Any], user_message: str) -> Dict[str, Any]:
+    return {"to": ctx.get("contact_phone"), "message": user_message}
+
+
+def _email_params(ctx: Mapping[str, Any], user_message: str) -> Dict[str, Any]:
+    return {
+        "to": ctx.get("contact_email"),
+        "subject": f"Message from {ctx.get('name', 'BizGenie')} customer",
+        "body": user_message,
+    }
+
+
+def _event_params(ctx: Mapping[str, Any], user_message: str) -> Dict[str, Any]:
+    contact_email = ctx.get("contact_email")
+    return {
+        "title": f"Appointment for {ctx.get('name', 'BizGenie')}",
+        # NOTE: In a real system you’d parse actual time, attendees, etc.
+        "start_dt": None,
+        "end_dt": None,
+        "description": user_message,
+        "attendees_emails": [contact_email] if contact_email else [],
+        "location": ctx.get("address"),
+        "send_via_email": True,
+        "send_via_whatsapp": False,
+    }
+
+
+# tool_name -> (params builder, human-facing confirmation sentence)
+_BUILDERS = {
+    "send_whatsapp": (_whatsapp_params, "Got it – I’ll send a WhatsApp message for you."),
+    "send_email": (_email_params, "Got it – I’ll send an email for you."),
+    "create_event": (_event_params, "I’ll generate an appointment invite for this."),
+}
+
+
+def extract_tool_requirements(user_message: str, business_context: Mapping[str, Any]) -> Dict[str, Any]:
     """
     Extract a simple tool request from the user's message.
 
@@ -31,45 +82,28 @@ def extract_tool_requirements(user_message: str, business_context: Dict[str, Any
           "answer_text": str         # Human-facing confirmation sentence
         }
     """
-    msg = user_message.lower()
-    params: Dict[str, Any] = {}
+    tags = {m.lastgroup for m in _TOOL_KEYWORDS_RE.finditer(user_message)}
     tool_name: Optional[str] = None
-    answer_text = "Okay, I'll handle that."
 
     # Very simple heuristics – you can improve later with LLM-based extraction
-    if "whatsapp" in msg or "message" in msg or "text" in msg:
+    if "whatsapp" in tags:
         tool_name = "send_whatsapp"
-        params["to"] = business_context.get("contact_phone")
-        params["message"] = user_message
-        answer_text = "Got it – I’ll send a WhatsApp message for you."
-
-    elif "email" in msg or "mail" in msg:
+    elif "email" in tags:
         tool_name = "send_email"
-        params["to"] = business_context.get("contact_email")
-        params["subject"] = f"Message from {business_context.get('name', 'BizGenie')} customer"
-        params["body"] = user_message
-        answer_text = "Got it – I’ll send an email for you."
-
-    elif "appointment" in msg and ("confirm" in msg or "confirmation" in msg or "invite" in msg):
+    elif "appointment" in tags and "confirm" in tags:
         tool_name = "create_event"
-        params["title"] = f"Appointment for {business_context.get('name', 'BizGenie')}"
-        # NOTE: In a real system you’d parse actual time, attendees, etc.
-        params["start_dt"] = None
-        params["end_dt"] = None
-        params["description"] = user_message
-        params["attendees_emails"] = (
-            [business_context.get("contact_email")]
-            if business_context.get("contact_email")
-            else []
-        )
-        params["location"] = business_context.get("address")
-        params["send_via_email"] = True
-        params["send_via_whatsapp"] = False
-        answer_text = "I’ll generate an appointment invite for this."
 
+    if tool_name is None:
+        return {
+            "tool_name": None,
+            "params": {},
+            "answer_text": "Okay, I'll handle that.",
+        }
+
+    build_params, answer_text = _BUILDERS[tool_name]
     return {
         "tool_name": tool_name,
-        "params": params,
+        "params": build_params(business_context, user_message),
         "answer_text": answer_text,
     }
 
@@ -84,7 +118,7 @@ def tools_executor_node(state: Dict[str, Any]) -> Dict[str, Any]:
     - Actual execution is handled by `tool_router` in graph.py
     """
     user_message = state.get("user_message", "") or ""
-    business_context = state.get("business_context", {}) or {}
+    business_context = state.get("business_context") or EMPTY_MAPPING
     tool_actions = state.get("tool_actions", []) or []
 
     try:
@@ -112,15 +146,11 @@ def tools_executor_node(state: Dict[str, Any]) -> Dict[str, Any]:
             "call_tool": call_tool,
         }
 
-        state["response"] = json.dumps(payload)
+        state["response"] = orjson.dumps(payload).decode()
         # We *plan* the tool here; graph.tool_router will append the real tool actions
         state["tool_actions"] = tool_actions
 
-        logger.info(
-            "tools_executor.planned",
-            tool_name=tool_name,
-            params=params,
-        )
+        logger.debug("tools_executor.planned", tool_name=tool_name)
 
     except Exception as exc:  # pragma: no cover
         logger.error("tools_executor.error", error=str(exc))
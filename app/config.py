@@ -3,15 +3,13 @@ Application configuration loaded from environment variables.
 """
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Any, Dict, Optional
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
-import structlog
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-logger = structlog.get_logger(__name__)
-
 
 def _mask(value: Optional[str]) -> Optional[str]:
     if value is None:
@@ -49,10 +47,12 @@ class Config(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
-    def masked_dict(self) -> Dict[str, Any]:
-        """Return settings dict with sensitive fields masked."""
+    @cached_property
+    def masked_dict(self) -> Mapping[str, Any]:
+        """Read-only settings mapping with sensitive fields masked (computed once)."""
         data = self.model_dump()
         sensitive_fields = {
             "WHATSAPP_ACCESS_TOKEN",
@@ -62,15 +62,16 @@ class Config(BaseSettings):
         for field in sensitive_fields:
             if field in data:
                 data[field] = _mask(data[field])
-        return data
+        return MappingProxyType(data)
 
     def __repr__(self) -> str:  # pragma: no cover - diagnostic helper
-        return f"Config({self.masked_dict()})"
+        return f"Config({dict(self.masked_dict)})"
+
+
+settings = Config()
 
 
-@lru_cache
 def get_settings() -> Config:
-    settings = Config()
-    logger.info("config.loaded", **settings.masked_dict())
+    """Return the process-wide settings instance (kept for existing callers)."""
     return settings
 
@@ -1,9 +1,12 @@
 """
 Database configuration and session management.
 """
+import hashlib
 import os
+from pathlib import Path
 from typing import Generator
-from sqlalchemy import create_engine
+from filelock import FileLock
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -23,11 +26,29 @@ if USE_SQLITE:
         pool_pre_ping=True,
         echo=False
     )
+
+    # WAL lets readers proceed while a write is in progress. File-backed
+    # SQLite uses SQLAlchemy's default QueuePool, so each session checks out its
+    # own connection (possibly on another thread, hence check_same_thread=False)
+    # and these pragmas run once per new pooled connection.
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+        cur.execute("PRAGMA cache_size=-65536")
+        cur.close()
 else:
     DATABASE_URL = os.getenv("DATABASE_URL")
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=1800,
+        pool_use_lifo=True,   # reuse the most recently returned (warm) connection
         echo=False
     )
 
@@ -53,16 +74,50 @@ def get_db() -> Generator:
 # --------------------------------------------------
 # SAFE init_db (async-ready + non-blocking)
 # --------------------------------------------------
+SCHEMA_LOCK_PATH = Path(os.getenv("SCHEMA_LOCK_PATH", "./.bizgenie.schema.lock"))
+SCHEMA_VERSION_PATH = Path(os.getenv("SCHEMA_VERSION_PATH", "./.bizgenie.schema.version"))
+
+
+def _schema_fingerprint() -> str:
+    """Hash of the target database plus every table/column the models declare."""
+    parts = [str(DATABASE_URL)]
+    for table in Base.metadata.sorted_tables:
+        parts.append(f"{table.name}:{','.join(c.name for c in table.columns)}")
+        parts.extend(sorted(index.name for index in table.indexes))
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
 def init_db():
     """
     Create all tables safely without blocking the server.
+
+    Every uvicorn worker calls this; the file lock lets one of them run
+    create_all, and the rest skip the DDL when the version file matches and
+    all tables exist.
     """
     try:
         # Import all models
         from app.models import Business, Document, Appointment, Lead
 
-        # Create tables
-        Base.metadata.create_all(bind=engine)
+        fingerprint = _schema_fingerprint()
+        with FileLock(str(SCHEMA_LOCK_PATH)):
+            # The version file only proves a past run; the database itself may
+            # have been reset since, so also confirm every table is present
+            if (
+                SCHEMA_VERSION_PATH.exists()
+                and SCHEMA_VERSION_PATH.read_text().strip() == fingerprint
+                and set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+            ):
+                print("📦 Database schema up to date, skipping create_all.")
+                return
+
+            # Create tables
+            Base.metadata.create_all(bind=engine)
+            # create_all skips indexes on tables that already exist
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=engine, checkfirst=True)
+            SCHEMA_VERSION_PATH.write_text(fingerprint)
 
         print("📦 Database initialized successfully.")
     except Exception as e:
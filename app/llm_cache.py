@@ -0,0 +1,74 @@
+"""
+In-process cache for LLM completions.
+
+Keyed by a SHA-256 of the model name and the full request payload (prompt
+plus generation parameters), so only byte-identical requests share an entry.
+Bounded LRU with a TTL; enabled with LLM_CACHE=1.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class LLMCache:
+    """LRU + TTL map from request fingerprint to completion text."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, payload: Dict[str, Any]) -> str:
+        raw = orjson.dumps({"m": model, "p": payload}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or now - item[0] > self.ttl_seconds:
+                if item is not None:
+                    del self._data[key]
+                self.stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            hits, misses = self.stats["hits"], self.stats["misses"]
+
+        logger.debug("llm_cache.hit", hit_rate=round(hits / (hits + misses), 3))
+        return item[1]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Global instance; None when caching is disabled
+llm_cache: Optional[LLMCache] = (
+    LLMCache(
+        maxsize=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "3600")),
+    )
+    if os.getenv("LLM_CACHE", "0").lower() in ("1", "true")
+    else None
+)
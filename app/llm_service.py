@@ -3,16 +3,39 @@ LLM Service using HuggingFace Inference API (Qwen2.5-7B-Instruct).
 Stable, no LangChain, uses httpx only.
 """
 
+import atexit
 import os
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 import httpx
+import orjson
 import structlog
 from dotenv import load_dotenv
 
+from app.llm_cache import LLMCache, llm_cache
+
 load_dotenv()
 logger = structlog.get_logger(__name__)
 
+# Generation parameters are the same for every request; built once and shared
+# read-only by every payload.
+_GENERATION_PARAMS: Dict[str, Any] = {
+    "max_new_tokens": 512,
+    "temperature": 0.4,
+    "top_p": 0.95,
+    "repetition_penalty": 1.05,
+    "do_sample": True,  # otherwise temperature / top_p are ignored
+    "return_full_text": False,  # completion only, no prompt echo on the wire
+}
+
+# Connection pool / timeouts shared by the sync and async clients
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0,
+)
+_HTTP_TIMEOUT = httpx.Timeout(80.0, connect=10.0)
+
 
 class LLMService:
     """Service for LLM inference using HuggingFace Inference API."""
@@ -41,18 +64,31 @@ class LLMService:
         self.api_url = f"https://api-inference.huggingface.co/models/{self.model_name}"
         self.headers = {"Authorization": f"Bearer {self.hf_api_key}"} if self.hf_api_key else {}
 
+        # One pooled HTTP/2 client for the process: keeps the TLS session to
+        # the inference endpoint warm instead of handshaking on every call.
+        self._client = httpx.Client(
+            http2=True, headers=self.headers, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT
+        )
+        atexit.register(self._client.close)
+
+        # Async twin for callers running on the event loop; created on first
+        # use and closed on app shutdown if it was ever opened.
+        self._aclient: Optional[httpx.AsyncClient] = None
+
         logger.info(
             "LLM Service initialized",
             provider="huggingface",
             model=self.model_name,
         )
 
-    def generate(self, prompt: str, context: Optional[str] = None) -> str:
-        """
-        Generate text using HuggingFace Inference API.
-        Returns clean generated text or a fallback message.
-        """
+    def _get_aclient(self) -> httpx.AsyncClient:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=True, headers=self.headers, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT
+            )
+        return self._aclient
 
+    def _build_payload(self, prompt: str, context: Optional[str]) -> Dict[str, Any]:
         # Build final prompt: your RAG prompt already includes docs & tool instructions,
         # so we just pass it through. If you WANT extra context, you can prepend it.
         if context:
@@ -60,76 +96,188 @@ class LLMService:
         else:
             full_prompt = prompt
 
+        return {"inputs": full_prompt, "parameters": _GENERATION_PARAMS}
+
+    def _parse_response(self, response: httpx.Response, full_prompt: str) -> Optional[str]:
+        """Extract the completion text, or None if the API call did not succeed."""
+        if response.status_code != 200:
+            logger.error(
+                "llm.api_error",
+                status=response.status_code,
+                body=response.text[:500],
+            )
+            return None
+
+        data = response.json()
+
+        # HuggingFace text-generation usually returns:
+        # [ { "generated_text": "...full prompt + completion..." } ]
+        text = ""
+
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            if "generated_text" in data[0]:
+                text = data[0]["generated_text"]
+            else:
+                text = str(data[0])
+        elif isinstance(data, dict) and "generated_text" in data:
+            text = data["generated_text"]
+        else:
+            # Last fallback: just stringify whatever we got
+            text = str(data)
+
+        if not isinstance(text, str):
+            text = str(text)
+
+        # return_full_text=False already omits the prompt; drop it anyway if an
+        # endpoint ignores the flag and echoes it back.
+        if text.startswith(full_prompt):
+            text = text[len(full_prompt):]
+
+        clean = text.strip()
+        if not clean:
+            logger.warning("llm.empty_response", raw=data)
+            return None
+
+        return clean
+
+    def generate(self, prompt: str, context: Optional[str] = None) -> str:
+        """
+        Generate text using HuggingFace Inference API.
+        Returns clean generated text or a fallback message.
+        """
         if not self.hf_api_key:
             logger.error("No HF API key set, using fallback")
             return self._fallback(prompt, context)
 
-        payload = {
-            "inputs": full_prompt,
-            "parameters": {
-                "max_new_tokens": 512,
-                "temperature": 0.4,
-                "top_p": 0.95,
-                "repetition_penalty": 1.05,
-            },
-        }
+        payload = self._build_payload(prompt, context)
+
+        # Identical requests (same prompt + params) are served from the cache
+        cache_key = LLMCache.make_key(self.model_name, payload) if llm_cache else None
+        if cache_key and (cached := llm_cache.get(cache_key)) is not None:
+            return cached
 
         try:
             logger.info("llm.request", model=self.model_name, url=self.api_url)
-
-            with httpx.Client(timeout=80.0) as client:
-                response = client.post(
-                    self.api_url,
-                    headers=self.headers,
-                    json=payload,
-                )
-
-            if response.status_code != 200:
-                logger.error(
-                    "llm.api_error",
-                    status=response.status_code,
-                    body=response.text[:500],
-                )
+            response = self._client.post(self.api_url, json=payload)
+            clean = self._parse_response(response, payload["inputs"])
+            if clean is None:
                 return self._fallback(prompt, context)
+            if cache_key:
+                llm_cache.set(cache_key, clean)
+            return clean
 
-            data = response.json()
+        except Exception as e:
+            logger.error("llm.exception", error=str(e))
+            return self._fallback(prompt, context)
+
+    async def agenerate(self, prompt: str, context: Optional[str] = None) -> str:
+        """
+        Async variant of `generate` for use inside route handlers / graph nodes:
+        the request awaits on the shared AsyncClient instead of blocking the loop.
+        """
+        if not self.hf_api_key:
+            logger.error("No HF API key set, using fallback")
+            return self._fallback(prompt, context)
 
-            # HuggingFace text-generation usually returns:
-            # [ { "generated_text": "...full prompt + completion..." } ]
-            text = ""
+        payload = self._build_payload(prompt, context)
 
-            if isinstance(data, list) and data and isinstance(data[0], dict):
-                if "generated_text" in data[0]:
-                    text = data[0]["generated_text"]
-                else:
-                    text = str(data[0])
-            elif isinstance(data, dict) and "generated_text" in data:
-                text = data["generated_text"]
-            else:
-                # Last fallback: just stringify whatever we got
-                text = str(data)
-
-            if not isinstance(text, str):
-                text = str(text)
-
-            # Many HF models echo the prompt. If our prompt contains "ANSWER:" or "Answer:",
-            # try to cut the output after that marker so user doesn't see the whole prompt.
-            for marker in ["ANSWER:", "Answer:", "Answer:", "answer:"]:
-                if marker in text:
-                    text = text.split(marker, 1)[-1].strip()
-                    break
-
-            clean = text.strip()
-            if not clean:
-                logger.warning("llm.empty_response", raw=data)
-                return self._fallback(prompt, context)
+        cache_key = LLMCache.make_key(self.model_name, payload) if llm_cache else None
+        if cache_key and (cached := llm_cache.get(cache_key)) is not None:
+            return cached
 
+        try:
+            logger.info("llm.request", model=self.model_name, url=self.api_url)
+            response = await self._get_aclient().post(self.api_url, json=payload)
+            clean = self._parse_response(response, payload["inputs"])
+            if clean is None:
+                return self._fallback(prompt, context)
+            if cache_key:
+                llm_cache.set(cache_key, clean)
             return clean
 
         except Exception as e:
             logger.error("llm.exception", error=str(e))
             return self._fallback(prompt, context)
 
+    async def agenerate_stream(
+        self, prompt: str, context: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text as it is produced (HF text-generation SSE).
+
+        Streamed tokens never include the echoed prompt, so no marker
+        trimming is needed. Yields the fallback message if nothing was
+        received before an error (including an SSE error frame) or the
+        stream ended empty.
+        """
+        if not self.hf_api_key:
+            logger.error("No HF API key set, using fallback")
+            yield self._fallback(prompt, context)
+            return
+
+        payload = self._build_payload(prompt, context)
+        payload["stream"] = True
+        received = False
+
+        try:
+            logger.info("llm.request", model=self.model_name, url=self.api_url, stream=True)
+            async with self._get_aclient().stream(
+                "POST",
+                self.api_url,
+                json=payload,
+                headers={"Accept": "text/event-stream"},
+            ) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    logger.error(
+                        "llm.api_error",
+                        status=response.status_code,
+                        body=body[:500].decode("utf-8", "replace"),
+                    )
+                    yield self._fallback(prompt, context)
+                    return
+
+                async for line in response.aiter_lines():
+                    # SSE frames look like: data:{"token": {"text": "...", "special": false}, ...}
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if not data or data == "[DONE]":
+                        continue
+
+                    event = orjson.loads(data)
+                    # Model loading / rate limiting arrive as an error frame
+                    if "error" in event:
+                        logger.error(
+                            "llm.api_error",
+                            status=response.status_code,
+                            body=str(event["error"])[:500],
+                        )
+                        if not received:
+                            yield self._fallback(prompt, context)
+                        return
+
+                    token = event.get("token") or {}
+                    text = token.get("text")
+                    if text and not token.get("special"):
+                        received = True
+                        yield text
+
+                if not received:
+                    logger.warning("llm.empty_response", stream=True)
+                    yield self._fallback(prompt, context)
+
+        except Exception as e:
+            logger.error("llm.exception", error=str(e))
+            if not received:
+                yield self._fallback(prompt, context)
+
+    async def aclose(self) -> None:
+        """Close the async client, if one was opened (called from the app shutdown hook)."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
     def _fallback(self, prompt: str, context: Optional[str] = None) -> str:
         """
         Fallback message when HF API fails.
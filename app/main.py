@@ -1,11 +1,19 @@
 """
 BizGenie - Main FastAPI application.
 """
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import orjson
 import structlog
 
+from app.config import settings
 from app.database import init_db
+from app.rag.vectorstore import vector_store
 from app.routes import chat, business, tools, appointments
 
 # Configure structured logging
@@ -15,11 +23,17 @@ structlog.configure(
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.TimeStamper(fmt=None, utc=True),  # epoch seconds, no strftime
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(),
+        # orjson returns bytes; the stdlib logger sink expects str.
+        # OPT_NON_STR_KEYS: int (etc.) dict keys must not raise inside logger calls
+        structlog.processors.JSONRenderer(
+            serializer=lambda obj, **kw: orjson.dumps(
+                obj, option=orjson.OPT_NON_STR_KEYS, **kw
+            ).decode()
+        ),
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -29,10 +43,35 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    logger.info("config.loaded", **settings.masked_dict)
+    init_db()
+    logger.info("Database tables verified/created")
+
+    # Opt-in: load the embedding model before serving, so the first chat
+    # request doesn't pay for it. Off by default because the model is kept
+    # lazy to fit small instances' memory and cold-start budget.
+    if os.getenv("EMBEDDING_WARMUP", "false").lower() == "true":
+        await asyncio.to_thread(vector_store.warmup)
+
+    yield
+
+    # Shutdown: close the LLM client only if something imported the service;
+    # importing it here would build the clients on every start
+    llm_module = sys.modules.get("app.llm_service")
+    if llm_module is not None:
+        await llm_module.llm_service.aclose()
+    logger.info("Shutting down BizGenie application")
+
+
 app = FastAPI(
     title="BizGenie API",
     description="Micro-SaaS small-business support AI agent",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS for frontend http://localhost:3000
@@ -51,17 +90,6 @@ app.include_router(tools.router)
 app.include_router(appointments.router)
 
 
-@app.on_event("startup")
-async def startup_event():
-    init_db()
-    logger.info("Database tables verified/created")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Shutting down BizGenie application")
-
-
 @app.get("/")
 async def root():
     return {
@@ -1,7 +1,7 @@
 """
 SQLAlchemy database models.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -41,6 +41,11 @@ class Document(Base):
 
     business = relationship("Business", back_populates="documents")
 
+    __table_args__ = (
+        # Per-business document listings ordered by upload time
+        Index("ix_doc_biz_created", "business_id", "created_at"),
+    )
+
 
 class Appointment(Base):
     """Appointment model."""
@@ -64,6 +69,11 @@ class Appointment(Base):
 
     business = relationship("Business", back_populates="appointments")
 
+    __table_args__ = (
+        # "Appointments for business X between dates A and B" (calendar views)
+        Index("ix_appt_biz_date", "business_id", "appointment_date"),
+    )
+
 
 class Lead(Base):
     """Lead model."""
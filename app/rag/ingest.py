@@ -2,9 +2,9 @@
 Document ingestion pipeline for RAG.
 """
 import os
-from typing import List, Dict, Any, Optional
-from PyPDF2 import PdfReader
+from typing import Any, Dict, Iterator, List, Optional
 import structlog
+from app.rag.pdf import extract_pages
 from app.rag.vectorstore import vector_store
 
 logger = structlog.get_logger(__name__)
@@ -21,17 +21,63 @@ def extract_text_from_pdf(file_path: str) -> str:
         Extracted text
     """
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        logger.info("Extracted text from PDF", file_path=file_path, pages=len(reader.pages))
+        pages = extract_pages(file_path)
+        text = "".join(f"{page}\n" for page in pages)
+        logger.info("Extracted text from PDF", file_path=file_path, pages=len(pages))
         return text
     except Exception as e:
         logger.error("Error extracting text from PDF", file_path=file_path, error=str(e))
         raise
 
 
+# Preferred break points, strongest first: paragraph, line, sentence, word
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def iter_chunks(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> Iterator[str]:
+    """
+    Lazily split text into chunks for embedding.
+    
+    Each chunk is at most ``chunk_size`` characters and ends at the strongest
+    break found in the second half of its window (hard cut if none). The next
+    chunk starts ``chunk_overlap`` characters earlier, moved to a word start.
+    
+    Args:
+        text: Text to chunk
+        chunk_size: Size of each chunk
+        chunk_overlap: Overlap between chunks
+    
+    Yields:
+        Text chunks
+    """
+    n = len(text)
+    start = 0
+    while start < n:
+        end = min(start + chunk_size, n)
+        if end < n:
+            floor = start + chunk_size // 2
+            for sep in _SEPARATORS:
+                cut = text.rfind(sep, floor, end)
+                if cut != -1:
+                    end = cut + len(sep)
+                    break
+
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+        if end >= n:
+            break
+
+        next_start = end - chunk_overlap
+        if next_start <= start:
+            next_start = end
+        else:
+            space = text.find(" ", next_start, end)
+            if space != -1:
+                next_start = space + 1
+        start = next_start
+
+
 def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
     """
     Split text into chunks for embedding.
@@ -44,15 +90,7 @@ def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> L
     Returns:
         List of text chunks
     """
-    # TODO: Use LangChain's text splitter for better chunking
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        chunks.append(chunk)
-        start = end - chunk_overlap
-    return chunks
+    return list(iter_chunks(text, chunk_size, chunk_overlap))
 
 
 def ingest_document(
@@ -84,32 +122,33 @@ def ingest_document(
             logger.warning("Unsupported file type", file_ext=file_ext)
             return False
         
-        # Chunk the text
-        chunks = chunk_text(text)
-        
-        # Prepare documents for vector store
-        documents = []
-        for i, chunk in enumerate(chunks):
-            documents.append({
-                "text": chunk,
-                "metadata": {
-                    "filename": filename,
-                    "chunk_index": i,
-                    "business_id": business_id,
-                    **(metadata or {})
-                },
-                "id": f"{business_id}_{filename}_{i}"
-            })
+        # Chunk lazily; the vector store embeds and stores one batch at a time
+        chunk_count = 0
+
+        def _documents():
+            nonlocal chunk_count
+            for i, chunk in enumerate(iter_chunks(text)):
+                chunk_count = i + 1
+                yield {
+                    "text": chunk,
+                    "metadata": {
+                        "filename": filename,
+                        "chunk_index": i,
+                        "business_id": business_id,
+                        **(metadata or {})
+                    },
+                    "id": f"{business_id}_{filename}_{i}"
+                }
         
         # Add to vector store
-        success = vector_store.add_documents(business_id, documents)
+        success = vector_store.add_documents_iter(business_id, _documents())
         
         if success:
             logger.info(
                 "Document ingested successfully",
                 business_id=business_id,
                 filename=filename,
-                chunks=len(chunks)
+                chunks=chunk_count
             )
         
         return success
@@ -140,11 +179,8 @@ def ingest_text(
         True if successful
     """
     try:
-        chunks = chunk_text(text)
-        
-        documents = []
-        for i, chunk in enumerate(chunks):
-            documents.append({
+        documents = (
+            {
                 "text": chunk,
                 "metadata": {
                     "chunk_index": i,
@@ -152,9 +188,11 @@ def ingest_text(
                     **(metadata or {})
                 },
                 "id": f"{business_id}_text_{i}"
-            })
+            }
+            for i, chunk in enumerate(iter_chunks(text))
+        )
         
-        return vector_store.add_documents(business_id, documents)
+        return vector_store.add_documents_iter(business_id, documents)
     except Exception as e:
         logger.error("Error ingesting text", business_id=business_id, error=str(e))
         return False
@@ -0,0 +1,83 @@
+"""
+PDF text extraction.
+
+PyPDF2's `extract_text` is pure Python and CPU-bound, so large PDFs are split
+into page ranges that are extracted in parallel worker processes. Small PDFs
+are read in-process, where pool overhead would dominate.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+
+
+def _available_cpus() -> int:
+    # os.cpu_count() reports the host's CPUs, not the ones this process may use
+    # (affinity / container quota), which oversubscribes small instances
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 CPU quota, e.g. "50000 100000" for half a CPU, or "max"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+# PDF_MAX_WORKERS overrides the detected CPU count
+_MAX_WORKERS = int(os.getenv("PDF_MAX_WORKERS", "0")) or min(_available_cpus(), 8)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that holds torch / DB connections is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=_MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _extract_range(file_path: str, start: int, stop: int) -> List[str]:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_pages(file_path: str) -> List[str]:
+    """Return the text of every page in `file_path`, in page order."""
+    # Imported on first use so app startup doesn't pay for PyPDF2
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    n_pages = len(reader.pages)
+
+    if n_pages < PARALLEL_MIN_PAGES or _MAX_WORKERS < 2:
+        return [page.extract_text() or "" for page in reader.pages]
+
+    # One contiguous page range per worker, so each process parses the file once
+    step = -(-n_pages // _MAX_WORKERS)
+    executor = _get_executor()
+    futures = [
+        executor.submit(_extract_range, file_path, start, min(start + step, n_pages))
+        for start in range(0, n_pages, step)
+    ]
+
+    pages: List[str] = []
+    for future in futures:
+        pages.extend(future.result())
+    return pages
@@ -0,0 +1,143 @@
+"""
+In-process semantic cache for RAG retrieval.
+
+Remembers which documents were retrieved for a query embedding, per business,
+so near-duplicate questions ("what are your hours?" / "when are you open?")
+skip the vector store lookup. Entries expire after a TTL and are dropped
+whenever a business's documents change.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class _Namespace:
+    """
+    Cached entries for one (business_id, n_results) pair.
+
+    Embeddings live in one contiguous float32 matrix so a lookup is a single
+    BLAS matrix-vector product. The matrix grows geometrically up to
+    ``capacity`` rows and is then reused as a ring buffer (oldest row is
+    overwritten first).
+    """
+
+    def __init__(self, dim: int, capacity: int) -> None:
+        self.capacity = capacity
+        self.embeddings = np.empty((min(16, capacity), dim), dtype=np.float32)
+        self.documents: List[List[Dict[str, Any]]] = []
+        self.stored_at: List[float] = []
+        self.size = 0
+        self.next = 0  # ring pointer once full
+
+    @property
+    def dim(self) -> int:
+        return self.embeddings.shape[1]
+
+    def add(self, q: np.ndarray, documents: List[Dict[str, Any]], now: float) -> None:
+        if self.size < self.capacity:
+            row = self.size
+            if row == self.embeddings.shape[0]:
+                grown = np.empty(
+                    (min(row * 2, self.capacity), self.dim), dtype=np.float32
+                )
+                grown[:row] = self.embeddings
+                self.embeddings = grown
+            self.documents.append(documents)
+            self.stored_at.append(now)
+            self.size += 1
+        else:
+            row = self.next
+            self.next = (row + 1) % self.capacity
+            self.documents[row] = documents
+            self.stored_at[row] = now
+        self.embeddings[row] = q
+
+
+class SemanticCache:
+    """Cosine-similarity cache of retrieval results, namespaced per business."""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 256,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._namespaces: Dict[Tuple[int, int], _Namespace] = {}
+        # Retrieval runs in worker threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _as_row(embedding: np.ndarray) -> np.ndarray:
+        # Query embeddings arrive L2-normalized from the vector store encoder
+        return np.asarray(embedding, dtype=np.float32).ravel()
+
+    def get(
+        self,
+        business_id: int,
+        embedding: np.ndarray,
+        n_results: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        q = self._as_row(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            ns = self._namespaces.get((business_id, n_results))
+            if ns is None or not ns.size or ns.dim != q.shape[0]:
+                return None
+
+            scores = ns.embeddings[: ns.size] @ q
+            best = int(scores.argmax())
+            if scores[best] < self.threshold:
+                return None
+            if now - ns.stored_at[best] > self.ttl_seconds:
+                return None
+
+            documents = ns.documents[best]
+
+        logger.debug(
+            "semantic_cache.hit",
+            business_id=business_id,
+            score=float(scores[best]),
+        )
+        return documents
+
+    def put(
+        self,
+        business_id: int,
+        embedding: np.ndarray,
+        n_results: int,
+        documents: List[Dict[str, Any]],
+    ) -> None:
+        q = self._as_row(embedding)
+        now = time.monotonic()
+        key = (business_id, n_results)
+
+        with self._lock:
+            ns = self._namespaces.get(key)
+            if ns is None or ns.dim != q.shape[0]:
+                ns = self._namespaces[key] = _Namespace(q.shape[0], self.max_entries)
+            ns.add(q, documents, now)
+
+    def invalidate(self, business_id: int) -> None:
+        """Drop every cached result for a business (documents changed)."""
+        with self._lock:
+            for key in [k for k in self._namespaces if k[0] == business_id]:
+                del self._namespaces[key]
+
+
+# Global instance
+semantic_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+    ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL", "300")),
+)
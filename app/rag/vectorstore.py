@@ -1,32 +1,172 @@
 """
 Vector store used by BizGenie RAG.
 
-The store *tries* to use ChromaDB (with persistent storage and high recall) but
-falls back to a very small, pure-Python embedding store when native
-dependencies such as `onnxruntime`, `hnswlib`, or `grpcio` are unavailable.
+By default documents live in a very small, numpy-backed embedding store with
+no native dependencies. With USE_CHROMA=true the store *tries* to use ChromaDB
+(with persistent storage and high recall) and falls back to the simple store
+when `onnxruntime`, `hnswlib`, or `grpcio` are unavailable.
 
 Both modes expose the same `add_documents` / `query_documents` interface.
 """
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 import numpy as np
+import orjson
 from dotenv import load_dotenv
+from filelock import FileLock
 import structlog
 
+from app.rag.semantic_cache import semantic_cache
+
 load_dotenv()
 
 logger = structlog.get_logger(__name__)
 
 
+_EMBED_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+
+# HNSW settings for new Chroma collections. Embeddings are L2-normalized, so
+# cosine is the natural space; M / construction_ef favour recall at build time.
+_HNSW_METADATA: Dict[str, Any] = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
+
+# Simple-store query: rows upcast per block of the int8 scan, and how many of
+# the best int8 scores are rescored against the fp16 rows (raise it to trade
+# scan-side speed for recall).
+_SCAN_BLOCK_ROWS = 8192
+_RERANK_CANDIDATES = 32
+# Initial row capacity of the simple-store matrices (doubled when full)
+_MIN_STORE_ROWS = 1024
+
+
+def _quantize_rows(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: ``rows ~= q * scales[:, None]``."""
+    scales = np.abs(rows).max(axis=1) / 127.0
+    safe = np.where(scales > 0, scales, 1.0)
+    q = np.clip(np.rint(rows / safe[:, None]), -127, 127).astype(np.int8)
+    return q, scales.astype(np.float32)
+
+
+def _write_npy_rows(path: Path, start: int, rows: np.ndarray, business_id: int) -> None:
+    """
+    Write ``rows`` at row ``start`` of the .npy matrix in ``path``, in place
+    when the file has room. Otherwise grow it geometrically: copy the first
+    ``start`` rows into a file twice the size and swap it in atomically, so
+    appends cost amortized O(rows) I/O. Unwritten rows are zero.
+    """
+    stop = start + len(rows)
+    old = np.load(path, mmap_mode="r+") if path.exists() else None
+    if old is not None and (old.shape[1:] != rows.shape[1:] or old.dtype != rows.dtype):
+        logger.warning(
+            "Embedding dimension changed, dropping stored vectors",
+            business_id=business_id,
+            old_shape=old.shape,
+            new_shape=rows.shape,
+        )
+        old = None
+
+    if old is not None and len(old) >= stop:
+        old[start:stop] = rows
+        old.flush()
+        return
+
+    capacity = max(stop, 2 * len(old) if old is not None else 0, _MIN_STORE_ROWS)
+    tmp_path = path.with_suffix(".tmp.npy")
+    out = np.lib.format.open_memmap(
+        tmp_path, mode="w+", dtype=rows.dtype, shape=(capacity, *rows.shape[1:])
+    )
+    m = min(len(old), start) if old is not None else 0
+    if m:
+        out[:m] = old[:m]
+    out[start:stop] = rows
+    out.flush()
+    del out, old
+    os.replace(tmp_path, path)
+
+
 def _ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def _enable_sqlite_wal(db_path: Path) -> None:
+    """
+    Switch Chroma's SQLite file to WAL. journal_mode is stored in the file,
+    so it applies to Chroma's own connections: commits append to the log
+    instead of rewriting the rollback journal, and readers don't block.
+    """
+    if not db_path.exists():
+        return
+    try:
+        con = sqlite3.connect(db_path)
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+        finally:
+            con.close()
+    except sqlite3.Error as e:
+        logger.warning("Could not enable WAL on Chroma store", error=str(e))
+
+
+@functools.cache
+def _get_embedder(model_name: str, backend: str, onnx_file: str):
+    """
+    Build the SentenceTransformer once per process for a given configuration.
+    torch / sentence-transformers are imported here, on first use, so importing
+    this module stays cheap. Failures raise and are not cached.
+    """
+    import torch  # type: ignore
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    if torch.cuda.is_available():
+        device = "cuda"
+    elif torch.backends.mps.is_available():
+        device = "mps"
+    else:
+        device = "cpu"
+
+    logger.info("Loading embeddings model lazily", model=model_name, device=device)
+
+    model = None
+    if backend == "onnx" and device == "cpu":
+        # Needs sentence-transformers>=3.2 with the [onnx] extra; the
+        # quantized file is published alongside the MiniLM checkpoints.
+        try:
+            model = SentenceTransformer(
+                model_name,
+                device=device,
+                backend="onnx",
+                model_kwargs={"file_name": onnx_file},
+            )
+        except Exception as onnx_error:
+            logger.warning(
+                "ONNX embedding backend unavailable, using torch",
+                error=str(onnx_error),
+            )
+
+    if model is None:
+        model = SentenceTransformer(model_name, device=device)
+        if device == "cuda":
+            # fp16 halves memory traffic; cosine scores are unaffected in practice
+            model.half()
+
+    logger.info("Embeddings model loaded successfully", model=model_name, device=device)
+    return model
+
+
 class VectorStore:
     """Wrapper that chooses between ChromaDB and a lightweight fallback store."""
 
@@ -36,10 +176,28 @@ class VectorStore:
 
         # Lazy embedding model: do NOT import or load at startup
         self.embedding_model = None
+        self._model_lock = threading.Lock()
+        self._prefetched: set[int] = set()
+        # Process-wide embedding LRU: blake2b(text) -> float32 vector
+        self._embed_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._embed_cache_lock = threading.Lock()
+        # Chroma collection handles by business_id (avoids a SQLite lookup per call)
+        self._collections: Dict[int, Any] = {}
+        # Per-business file locks serializing simple-store writers (append /
+        # migrate / delete) across threads and uvicorn worker processes
+        self._simple_locks: Dict[int, FileLock] = {}
+        # Keyword fallback: business_id -> ((mtime_ns, size) of sidecar, lowercased texts)
+        self._lowered_cache: Dict[int, Tuple[Tuple[int, int], List[bytes]]] = {}
         self.embedding_model_name: Optional[str] = os.getenv(
             "EMBEDDING_MODEL", "all-MiniLM-L6-v2"
         )
 
+        # "torch" (default) or "onnx": int8-quantized ONNX Runtime model on CPU
+        self.embedding_backend: str = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+        self.embedding_onnx_file: str = os.getenv(
+            "EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx"
+        )
+
         # If user explicitly disables embeddings → never even try to import
         if self.embedding_model_name and self.embedding_model_name.lower() == "none":
             logger.warning(
@@ -48,26 +206,39 @@ class VectorStore:
             )
             self.embedding_model_name = None
 
-        # Simple JSON-based fallback store directory
+        # Simple fallback store directory (per business: fp16 + int8 .npy
+        # matrices, per-row scales and a .jsonl text/metadata sidecar)
         self.simple_dir = Path(os.getenv("SIMPLE_VECTOR_DIR", "./storage/vector_cache"))
         _ensure_dir(self.simple_dir)
 
         # ------------------------
-        # Try to initialize Chroma
+        # Try to initialize Chroma (opt-in)
         # ------------------------
+        # Deployments have always served from the simple store: the client
+        # used to pass the pre-0.4 chroma_db_impl setting, which chromadb
+        # 0.4.x rejects, so Chroma setup failed on every start. Chroma is
+        # therefore opt-in via USE_CHROMA=true. Nothing copies the simple
+        # store into Chroma, so documents indexed under SIMPLE_VECTOR_DIR
+        # must be re-uploaded after switching.
+        if os.getenv("USE_CHROMA", "false").lower() != "true":
+            logger.info("Using simple vector store", simple_dir=str(self.simple_dir))
+            return
+
         persist_directory = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
         try:
             import chromadb  # type: ignore
             from chromadb.config import Settings  # type: ignore
 
+            # is_persistent is what makes the 0.4 client write to persist_directory
             settings = Settings(
-                chroma_db_impl="chromadb",
+                is_persistent=True,
                 persist_directory=persist_directory,
                 anonymized_telemetry=False,
                 allow_reset=True,
             )
             self.client = chromadb.Client(settings)
             self.mode = "chroma"
+            _enable_sqlite_wal(Path(persist_directory) / "chroma.sqlite3")
             logger.info("ChromaDB client initialized", persist_directory=persist_directory)
         except Exception as chroma_error:
             logger.error(
@@ -90,17 +261,17 @@ class VectorStore:
         if self.embedding_model is not None or self.embedding_model_name is None:
             return
 
-        try:
-            from sentence_transformers import SentenceTransformer  # type: ignore
+        # Prefetch and a first query may race from worker threads; load once
+        with self._model_lock:
+            if self.embedding_model is None and self.embedding_model_name is not None:
+                self._load_embedding_model()
 
-            logger.info(
-                "Loading embeddings model lazily",
-                model=self.embedding_model_name,
-            )
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
-            logger.info(
-                "Embeddings model loaded successfully",
-                model=self.embedding_model_name,
+    def _load_embedding_model(self) -> None:
+        try:
+            self.embedding_model = _get_embedder(
+                self.embedding_model_name,
+                self.embedding_backend,
+                self.embedding_onnx_file,
             )
         except Exception as e:
             logger.warning(
@@ -171,24 +342,152 @@ class VectorStore:
     # Simple fallback implementation
     # ------------------------------------------------------------------
     def _simple_path(self, business_id: int) -> Path:
+        # Legacy single-file JSON store; migrated on first touch
         return self.simple_dir / f"business_{business_id}.json"
 
-    def _load_simple_store(self, business_id: int) -> List[Dict[str, Any]]:
-        path = self._simple_path(business_id)
-        if not path.exists():
+    def _simple_paths(self, business_id: int) -> Tuple[Path, Path]:
+        """(fp16 vector matrix, JSONL text/metadata sidecar); row i pairs with line i."""
+        return (
+            self.simple_dir / f"vecs_{business_id}.npy",
+            self.simple_dir / f"meta_{business_id}.jsonl",
+        )
+
+    def _quantized_paths(self, business_id: int) -> Tuple[Path, Path]:
+        """(int8 scan matrix, float32 per-row scales) kept alongside the fp16 rows."""
+        return (
+            self.simple_dir / f"qvecs_{business_id}.npy",
+            self.simple_dir / f"scales_{business_id}.npy",
+        )
+
+    def _simple_lock(self, business_id: int) -> FileLock:
+        """
+        Inter-process write lock for one business's simple store. One instance
+        per business, so nested acquisition (migrate -> append) is reentrant;
+        FileLock is thread-local, so threads still exclude each other.
+        """
+        lock = self._simple_locks.get(business_id)
+        if lock is None:
+            lock = self._simple_locks.setdefault(
+                business_id, FileLock(str(self.simple_dir / f"business_{business_id}.lock"))
+            )
+        return lock
+
+    @staticmethod
+    def _read_simple_lines(meta_path: Path) -> List[bytes]:
+        """Complete sidecar lines only; a half-written trailing line is ignored."""
+        if not meta_path.exists():
             return []
+        data = meta_path.read_bytes()
+        return data[: data.rfind(b"\n") + 1].splitlines()
+
+    def _lowered_texts(
+        self, business_id: int, meta_path: Path, lines: List[bytes]
+    ) -> List[bytes]:
+        """
+        Lowercased UTF-8 text of each sidecar line for the keyword fallback,
+        rebuilt only when the sidecar changes.
+        """
+        st = meta_path.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._lowered_cache.get(business_id)
+        if cached is not None and cached[0] == key and len(cached[1]) == len(lines):
+            return cached[1]
+
+        lowered = [orjson.loads(line)["text"].lower().encode("utf-8") for line in lines]
+        self._lowered_cache[business_id] = (key, lowered)
+        return lowered
+
+    def _append_simple_store(
+        self,
+        business_id: int,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[np.ndarray],
+    ) -> None:
+        """
+        Append rows to the simple store. The matrices are over-allocated, so
+        the number of complete sidecar lines is the row count: vectors are
+        written first and the sidecar appended last, and readers never see a
+        text whose vector is not in place yet.
+        """
+        vec_path, meta_path = self._simple_paths(business_id)
+        with self._simple_lock(business_id):
+            n_existing = len(self._read_simple_lines(meta_path))
+
+            if embeddings is None and vec_path.exists():
+                # Keep row i paired with line i; zero rows (scale 0) are
+                # skipped by the query scan
+                dim = np.load(vec_path, mmap_mode="r").shape[1]
+                embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+
+            if embeddings is not None:
+                qvec_path, scale_path = self._quantized_paths(business_id)
+                qvecs, scales = _quantize_rows(embeddings)
+                for path, rows in (
+                    (vec_path, embeddings.astype(np.float16)),
+                    (scale_path, scales),
+                    (qvec_path, qvecs),
+                ):
+                    _write_npy_rows(path, n_existing, rows, business_id)
+
+            with meta_path.open("ab") as f:
+                f.writelines(
+                    orjson.dumps({"id": ids[i], "text": text, "metadata": metadatas[i]}) + b"\n"
+                    for i, text in enumerate(texts)
+                )
+
+    def _migrate_simple_store(self, business_id: int) -> None:
+        """
+        Convert a legacy ``business_{id}.json`` store to the .npy + .jsonl
+        layout, and build the int8 scan matrix for stores written before it.
+        """
+        legacy = self._simple_path(business_id)
+        vec_path, _ = self._simple_paths(business_id)
+        qvec_path, scale_path = self._quantized_paths(business_id)
+        if not legacy.exists() and (qvec_path.exists() or not vec_path.exists()):
+            return
+        with self._simple_lock(business_id):
+            if legacy.exists():
+                self._migrate_legacy_file(business_id, legacy)
+            if vec_path.exists() and not qvec_path.exists():
+                qvecs, scales = _quantize_rows(np.load(vec_path).astype(np.float32))
+                np.save(scale_path, scales)
+                np.save(qvec_path, qvecs)
+
+    def _migrate_legacy_file(self, business_id: int, legacy: Path) -> None:
         try:
-            with path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
-                return data if isinstance(data, list) else []
+            entries = orjson.loads(legacy.read_bytes())
         except Exception as e:
             logger.warning("Failed to read simple vector store", error=str(e))
-            return []
-
-    def _save_simple_store(self, business_id: int, data: List[Dict[str, Any]]) -> None:
-        path = self._simple_path(business_id)
-        with path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh)
+            return
+        if not isinstance(entries, list):
+            entries = []
+
+        embeddings = None
+        dims = {len(entry["embedding"]) for entry in entries if entry.get("embedding")}
+        if len(dims) == 1:
+            embeddings = np.zeros((len(entries), dims.pop()), dtype=np.float32)
+            for i, entry in enumerate(entries):
+                if entry.get("embedding"):
+                    embeddings[i] = entry["embedding"]
+            # Older rows predate normalize_embeddings=True; make every row unit
+            # length so queries can skip the per-row norm
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.where(norms > 0, norms, 1.0)
+
+        self._append_simple_store(
+            business_id,
+            [entry.get("text", "") for entry in entries],
+            [entry.get("metadata") or {} for entry in entries],
+            [
+                entry.get("id") if entry.get("id") is not None else f"doc_{business_id}_{i}"
+                for i, entry in enumerate(entries)
+            ],
+            embeddings,
+        )
+        legacy.unlink()
+        logger.info("Migrated simple vector store", business_id=business_id, rows=len(entries))
 
     def _embed_texts(self, texts: List[str]) -> Optional[np.ndarray]:
         if not texts:
@@ -200,11 +499,81 @@ class VectorStore:
         if not self.embedding_model:
             return None
 
+        # Identical texts (repeat questions, re-uploaded documents) skip the model
+        keys = [hashlib.blake2b(t.encode("utf-8"), digest_size=16).digest() for t in texts]
+        rows: List[Optional[np.ndarray]] = [None] * len(texts)
+        misses: List[int] = []
+        with self._embed_cache_lock:
+            for i, key in enumerate(keys):
+                row = self._embed_cache.get(key)
+                if row is None:
+                    misses.append(i)
+                else:
+                    self._embed_cache.move_to_end(key)
+                    rows[i] = row
+
+        if misses:
+            try:
+                # Unit-length vectors: cosine similarity becomes a plain dot product
+                encoded = self.embedding_model.encode(
+                    [texts[i] for i in misses],
+                    batch_size=128,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False,
+                )
+                # Stored / compared vectors stay float32 even when the model runs in fp16
+                encoded = encoded.astype(np.float32, copy=False)
+            except Exception as e:
+                logger.warning("Embedding generation failed", error=str(e))
+                return None
+
+            with self._embed_cache_lock:
+                for row, i in zip(encoded, misses):
+                    row = row.copy()  # don't pin the whole batch array in the cache
+                    rows[i] = row
+                    self._embed_cache[keys[i]] = row
+                while len(self._embed_cache) > _EMBED_CACHE_SIZE:
+                    self._embed_cache.popitem(last=False)
+
+        return np.vstack(rows)
+
+    def embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Embed a single query string, or None when embeddings are unavailable."""
+        q_np = self._embed_texts([query])
+        return q_np[0] if q_np is not None else None
+
+    def warmup(self) -> None:
+        """Load the embedding model and run one encode so first-call setup is paid upfront."""
+        self._embed_texts(["warmup"])
+
+    def prefetch(self, business_id: int) -> None:
+        """
+        Warm what the first query for a business needs: the embedding model
+        plus the Chroma collection handle or the simple store file (page cache).
+        Once a call succeeds, later calls for that business are no-ops; a
+        failed prefetch is retried on the next call.
+        """
+        if self.is_prefetched(business_id):
+            return
+
+        self._ensure_embedding_model()
         try:
-            return np.asarray(self.embedding_model.encode(texts, show_progress_bar=False))
+            if self.mode == "chroma" and self.client is not None:
+                self.get_collection(business_id)
+            else:
+                self._migrate_simple_store(business_id)
+                for path in self._simple_paths(business_id):
+                    if path.exists():
+                        path.read_bytes()
         except Exception as e:
-            logger.warning("Embedding generation failed", error=str(e))
-            return None
+            logger.warning("Vector store prefetch failed", business_id=business_id, error=str(e))
+            return
+        self._prefetched.add(business_id)
+
+    def is_prefetched(self, business_id: int) -> bool:
+        """True once `prefetch` has completed successfully for the business."""
+        return business_id in self._prefetched
 
     # ------------------------------------------------------------------
     # Shared public API
@@ -213,21 +582,14 @@ class VectorStore:
         if self.client is None:
             raise RuntimeError("Vector store client is not available")
 
-        collection_name = f"business_{business_id}"
-
-        try:
-            collection = self.client.get_collection(name=collection_name)
-            logger.debug(
-                "Retrieved existing collection",
-                business_id=business_id,
-                collection=collection_name,
-            )
-        except Exception:
-            collection = self.client.create_collection(
-                name=collection_name,
-                metadata={"business_id": business_id},
+        collection = self._collections.get(business_id)
+        if collection is None:
+            collection = self.client.get_or_create_collection(
+                name=f"business_{business_id}",
+                metadata={"business_id": business_id, **_HNSW_METADATA},
             )
-            logger.info("Created new collection", business_id=business_id)
+            self._collections[business_id] = collection
+            logger.debug("Opened collection", business_id=business_id)
 
         return collection
 
@@ -238,14 +600,74 @@ class VectorStore:
         embeddings: Optional[List[List[float]]] = None,
     ) -> bool:
 
-        texts = [doc.get("text", "") for doc in documents]
-        metadatas = [doc.get("metadata", {}) for doc in documents]
-        ids = [doc.get("id", f"doc_{business_id}_{i}") for i, doc in enumerate(documents)]
+        texts, metadatas, ids = self._unpack_documents(business_id, documents)
 
-        if self.mode == "chroma" and self.client is not None:
-            return self._add_documents_chroma(business_id, texts, metadatas, ids, embeddings)
+        semantic_cache.invalidate(business_id)
+        try:
+            if self.mode == "chroma" and self.client is not None:
+                return self._add_documents_chroma(business_id, texts, metadatas, ids, embeddings)
+
+            return self._add_documents_simple(business_id, texts, metadatas, ids)
+        finally:
+            # Again once the write has landed: a query that ran meanwhile may
+            # have re-cached the pre-write results
+            semantic_cache.invalidate(business_id)
+
+    @staticmethod
+    def _unpack_documents(
+        business_id: int,
+        documents: List[Dict[str, Any]],
+        offset: int = 0,
+    ) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """Split document dicts into parallel texts / metadatas / ids in one pass."""
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        ids: List[str] = []
+        add_text, add_meta, add_id = texts.append, metadatas.append, ids.append
+        for i, doc in enumerate(documents, start=offset):
+            add_text(doc.get("text", ""))
+            add_meta(doc.get("metadata", {}))
+            doc_id = doc.get("id")
+            add_id(doc_id if doc_id is not None else f"doc_{business_id}_{i}")
+        return texts, metadatas, ids
+
+    def add_documents_iter(
+        self,
+        business_id: int,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int = 64,
+    ) -> bool:
+        """
+        Add documents from an iterator, embedding and storing ``batch_size`` at
+        a time so only one batch is resident.
+        """
+        semantic_cache.invalidate(business_id)
 
-        return self._add_documents_simple(business_id, texts, metadatas, ids)
+        use_chroma = self.mode == "chroma" and self.client is not None
+        if not use_chroma:
+            logger.info("Using simple vector fallback", business_id=business_id)
+            self._migrate_simple_store(business_id)
+
+        doc_iter = iter(documents)
+        offset = 0
+        ok = True
+        try:
+            while batch := list(islice(doc_iter, batch_size)):
+                texts, metadatas, ids = self._unpack_documents(business_id, batch, offset)
+                offset += len(batch)
+
+                if use_chroma:
+                    ok = self._add_documents_chroma(business_id, texts, metadatas, ids, None) and ok
+                else:
+                    self._append_simple_store(
+                        business_id, texts, metadatas, ids, self._embed_texts(texts)
+                    )
+        finally:
+            # Ingestion can run in the background while chats are served; drop
+            # anything cached from the store's pre-ingest state
+            semantic_cache.invalidate(business_id)
+
+        return ok
 
     def _add_documents_chroma(
         self,
@@ -262,12 +684,10 @@ class VectorStore:
                 embeddings_np = self._embed_texts(texts)
                 embeddings = embeddings_np.tolist() if embeddings_np is not None else None
 
-            preview_texts = [t[:200] for t in texts]
             logger.info(
                 "Adding documents to collection",
                 business_id=business_id,
-                ids=ids,
-                preview=preview_texts,
+                count=len(ids),
             )
 
             if embeddings:
@@ -300,19 +720,8 @@ class VectorStore:
 
         logger.info("Using simple vector fallback", business_id=business_id)
 
-        existing = self._load_simple_store(business_id)
-        embeddings = self._embed_texts(texts)
-
-        for idx, text in enumerate(texts):
-            entry = {
-                "id": ids[idx],
-                "text": text,
-                "metadata": metadatas[idx],
-                "embedding": embeddings[idx].tolist() if embeddings is not None else None,
-            }
-            existing.append(entry)
-
-        self._save_simple_store(business_id, existing)
+        self._migrate_simple_store(business_id)
+        self._append_simple_store(business_id, texts, metadatas, ids, self._embed_texts(texts))
         return True
 
     # ------------------------------------------------------------------
@@ -323,25 +732,35 @@ class VectorStore:
         business_id: int,
         query: str,
         n_results: int = 5,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> List[Dict[str, Any]]:
+        """
+        Retrieve the closest documents for ``query``. Callers that already
+        embedded the query (e.g. for the semantic cache) can pass
+        ``query_embedding`` to skip re-encoding it.
+        """
 
         if self.mode == "chroma" and self.client is not None:
-            return self._query_chroma(business_id, query, n_results)
+            return self._query_chroma(business_id, query, n_results, query_embedding)
 
-        return self._query_simple(business_id, query, n_results)
+        return self._query_simple(business_id, query, n_results, query_embedding)
 
-    def _query_chroma(self, business_id: int, query: str, n_results: int):
+    def _query_chroma(
+        self,
+        business_id: int,
+        query: str,
+        n_results: int,
+        query_embedding: Optional[np.ndarray] = None,
+    ):
         try:
             collection = self.get_collection(business_id)
 
-            query_embedding = None
-            q_np = self._embed_texts([query])
-            if q_np is not None:
-                query_embedding = q_np.tolist()[0]
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
 
-            if query_embedding:
+            if query_embedding is not None:
                 results = collection.query(
-                    query_embeddings=[query_embedding], n_results=n_results
+                    query_embeddings=[query_embedding.tolist()], n_results=n_results
                 )
             else:
                 results = collection.query(query_texts=[query], n_results=n_results)
@@ -366,48 +785,86 @@ class VectorStore:
             logger.error("Error querying vector store", error=str(e))
             return []
 
-    def _query_simple(self, business_id: int, query: str, n_results: int):
-        entries = self._load_simple_store(business_id)
-        if not entries:
+    def _query_simple(
+        self,
+        business_id: int,
+        query: str,
+        n_results: int,
+        query_embedding: Optional[np.ndarray] = None,
+    ):
+        self._migrate_simple_store(business_id)
+        vec_path, meta_path = self._simple_paths(business_id)
+        lines = self._read_simple_lines(meta_path)
+        if not lines:
             return []
 
-        embeddings = np.array(
-            [entry["embedding"] for entry in entries if entry.get("embedding")]
-        )
-        texts = [entry["text"] for entry in entries]
-        metas = [entry.get("metadata", {}) for entry in entries]
+        vecs = np.load(vec_path, mmap_mode="r") if vec_path.exists() else None
 
         # Keyword search fallback
-        if embeddings.size == 0:
+        if vecs is None or len(vecs) == 0:
             results = []
-            query_lower = query.lower()
-            for text, meta in zip(texts, metas):
-                if query_lower in text.lower():
-                    results.append({"text": text, "metadata": meta, "distance": None})
-            return results[:n_results]
+            needle = query.lower().encode("utf-8")
+            for i, text_lower in enumerate(self._lowered_texts(business_id, meta_path, lines)):
+                if needle in text_lower:
+                    entry = orjson.loads(lines[i])
+                    results.append(
+                        {"text": entry["text"], "metadata": entry["metadata"], "distance": None}
+                    )
+                    if len(results) == n_results:
+                        break
+            return results
 
-        query_embedding = self._embed_texts([query])
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
         if query_embedding is None:
             return []
 
-        q = query_embedding[0]
-        similarities = embeddings @ q / (
-            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(q) + 1e-10
-        )
-
-        top = np.argsort(similarities)[::-1][:n_results]
-
-        return [
-            {
-                "text": texts[i],
-                "metadata": metas[i],
-                "distance": float(1 - similarities[i]),
-            }
-            for i in top
-        ]
+        qvec_path, scale_path = self._quantized_paths(business_id)
+        qvecs = np.load(qvec_path, mmap_mode="r")
+        scales = np.load(scale_path, mmap_mode="r")
+        n = min(len(vecs), len(qvecs), len(scales), len(lines))
+
+        # Stored rows and the query are unit length, so cosine is a plain dot
+        # product. Scan the int8 rows (a quarter of the fp32 bytes), then
+        # rescore the best candidates against the fp16 rows. This is
+        # approximate: a row whose int8 score misses the candidate set is not
+        # returned even if its fp16 score would have placed it in the top-k.
+        approx = np.empty(n, dtype=np.float32)
+        for start in range(0, n, _SCAN_BLOCK_ROWS):
+            stop = min(start + _SCAN_BLOCK_ROWS, n)
+            approx[start:stop] = (
+                np.asarray(qvecs[start:stop], dtype=np.float32) @ query_embedding
+            ) * scales[start:stop]
+
+        # Rows stored without an embedding are zero (scale 0); they would
+        # otherwise fill the top-k with distance 1.0
+        has_vector = np.asarray(scales[:n]) > 0
+        approx[~has_vector] = -np.inf
+        k = min(int(has_vector.sum()), max(n_results, _RERANK_CANDIDATES))
+        if k == 0:
+            return []
+        candidates = np.argpartition(-approx, k - 1)[:k] if k < n else np.arange(n)
+        exact = np.asarray(vecs[candidates], dtype=np.float32) @ query_embedding
+        order = np.argsort(exact)[::-1][:n_results]
+
+        results = []
+        for i in order:
+            entry = orjson.loads(lines[candidates[i]])
+            results.append(
+                {
+                    "text": entry["text"],
+                    "metadata": entry["metadata"],
+                    "distance": float(1 - exact[i]),
+                }
+            )
+        return results
 
     # ------------------------------------------------------------------
     def delete_collection(self, business_id: int) -> bool:
+        semantic_cache.invalidate(business_id)
+        self._collections.pop(business_id, None)
+        self._prefetched.discard(business_id)
+
         if self.mode == "chroma" and self.client is not None:
             try:
                 self.client.delete_collection(name=f"business_{business_id}")
@@ -416,9 +873,14 @@ class VectorStore:
                 logger.error("Error deleting collection", error=str(e))
                 return False
 
-        path = self._simple_path(business_id)
-        if path.exists():
-            path.unlink()
+        self._lowered_cache.pop(business_id, None)
+        with self._simple_lock(business_id):
+            for path in (
+                self._simple_path(business_id),
+                *self._simple_paths(business_id),
+                *self._quantized_paths(business_id),
+            ):
+                path.unlink(missing_ok=True)
         return True
 
 
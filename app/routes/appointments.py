@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import asyncio
 
 from app.database import get_db
 from app.models import Appointment, Business
@@ -40,31 +41,31 @@ async def create_appointment(payload: AppointmentCreate, db: Session = Depends(g
     db.commit()
     db.refresh(appt)
 
-    # 3) Customer confirmation email
+    # 3) Customer confirmation email + 4) calendar helper (email-based).
+    # Independent round-trips, so run them concurrently.
+    side_effects = {}
     if payload.customer_email:
-        try:
-            await send_email(
-                to=payload.customer_email,
-                subject="Appointment Confirmed",
-                body=f"Your appointment with {business.name} is booked on {payload.date} at {payload.time}.",
-            )
-        except Exception as exc:
-            print("Customer email failed:", exc)
-
-    # 4) Calendar helper (email-based)
-    try:
-        end_dt = appt_dt + timedelta(hours=1)
-        await create_event(
-            title=f"Appointment - {payload.customer_name}",
-            description=f"Online booking via BizGenie for {business.name}",
-            start_dt=appt_dt.isoformat(),
-            end_dt=end_dt.isoformat(),
-            location=None,
-            attendees_emails=[payload.customer_email] if payload.customer_email else [],
-            send_via_email=True,
-            send_via_whatsapp=False,
+        side_effects["Customer email"] = send_email(
+            to=payload.customer_email,
+            subject="Appointment Confirmed",
+            body=f"Your appointment with {business.name} is booked on {payload.date} at {payload.time}.",
         )
-    except Exception as exc:
-        print("Calendar helper failed:", exc)
+
+    end_dt = appt_dt + timedelta(hours=1)
+    side_effects["Calendar helper"] = create_event(
+        title=f"Appointment - {payload.customer_name}",
+        description=f"Online booking via BizGenie for {business.name}",
+        start_dt=appt_dt.isoformat(),
+        end_dt=end_dt.isoformat(),
+        location=None,
+        attendees_emails=[payload.customer_email] if payload.customer_email else [],
+        send_via_email=True,
+        send_via_whatsapp=False,
+    )
+
+    results = await asyncio.gather(*side_effects.values(), return_exceptions=True)
+    for label, result in zip(side_effects, results):
+        if isinstance(result, Exception):
+            print(f"{label} failed:", result)
 
     return appt
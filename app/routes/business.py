@@ -1,14 +1,14 @@
 """
 Business API routes for registration and management.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
 from typing import List
+import asyncio
 import os
 import uuid
 import structlog
-import PyPDF2
 
 from app.database import get_db
 from app.models import Business, Document
@@ -22,11 +22,14 @@ from app.schemas import (
     BusinessLoginRequest,
     DocumentResponse
 )
+from app.rag.ingest import extract_text_from_pdf, iter_chunks
 from app.rag.vectorstore import vector_store   # <-- DIRECT RAG INGESTION
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 async def notify_document_upload(business: Business, document_name: str) -> None:
     """Send WhatsApp/Email notifications after a document upload."""
@@ -56,6 +59,54 @@ async def notify_document_upload(business: Business, document_name: str) -> None
         except Exception as exc:
             logger.warning("business.doc_whatsapp_failed", error=str(exc))
 
+
+def ingest_uploaded_pdf(business_id: int, document_id: int, file_path: str, filename: str) -> None:
+    """
+    Extract, chunk and index an uploaded PDF. Runs as a background task
+    (in the threadpool) after the upload response has been sent.
+    """
+    try:
+        # Large PDFs are extracted across worker processes
+        extracted_text = extract_text_from_pdf(file_path)
+
+        if extracted_text.strip():
+            # One embedding per passage rather than per PDF: the embedder
+            # truncates long inputs, and retrieval should return the
+            # relevant paragraph, not the whole file
+            chunks = (
+                {
+                    "id": f"{document_id}_c{i}",
+                    "text": chunk,
+                    "metadata": {
+                        "filename": filename,
+                        "document_id": document_id,
+                        "chunk_index": i,
+                    },
+                }
+                for i, chunk in enumerate(iter_chunks(extracted_text))
+            )
+            vector_store.add_documents_iter(business_id, chunks)
+            logger.info("Document ingested into vector store", document_id=document_id)
+        else:
+            logger.warning("PDF had no extractable text", document_id=document_id)
+
+    except Exception as e:
+        logger.error("RAG ingestion failed", document_id=document_id, error=str(e))
+
+
+# Keep references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks: set = set()
+
+
+def prefetch_vectors(business_id: int) -> None:
+    """Warm the business's vector store off the request path (fire-and-forget)."""
+    if vector_store.is_prefetched(business_id):
+        return
+    task = asyncio.create_task(asyncio.to_thread(vector_store.prefetch, business_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
 router = APIRouter(prefix="/business", tags=["business"])
 
 
@@ -134,6 +185,7 @@ async def get_business(business_id: int, db: Session = Depends(get_db)) -> Busin
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
 
+    prefetch_vectors(business.id)
     return BusinessResponse.from_orm(business)
 
 
@@ -171,6 +223,7 @@ async def login_business(
             raise HTTPException(status_code=404, detail="Business not found with provided details.")
 
         logger.info("Business login successful", business_id=business.id)
+        prefetch_vectors(business.id)
         return BusinessResponse.model_validate(business)
 
     except Exception as e:
@@ -184,6 +237,7 @@ async def login_business(
 @router.post("/upload-docs", response_model=DocumentResponse)
 async def upload_documents(
     business_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ) -> DocumentResponse:
@@ -196,9 +250,6 @@ async def upload_documents(
         if not file.filename.endswith(".pdf"):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-        content = await file.read()
-        file_size = len(content)
-
         # ---------- SAVE FILE LOCALLY ----------
         storage_path = os.getenv("LOCAL_STORAGE_PATH", "./storage/documents")
         os.makedirs(storage_path, exist_ok=True)
@@ -207,8 +258,12 @@ async def upload_documents(
         saved_filename = f"{business_id}_{file_id}.pdf"
         file_path = os.path.join(storage_path, saved_filename)
 
+        # Stream to disk in 1 MiB pieces rather than holding the whole upload in memory
+        file_size = 0
         with open(file_path, "wb") as f:
-            f.write(content)
+            while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                file_size += len(chunk)
 
         logger.info("File saved locally", file_path=file_path)
 
@@ -225,35 +280,15 @@ async def upload_documents(
         db.commit()
         db.refresh(document)
 
-        # ---------- RAG INGESTION ----------
-        try:
-            extracted_text = ""
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    extracted_text += page.extract_text() or ""
-
-            if extracted_text.strip():
-                vector_store.add_documents(
-                    business_id=business_id,
-                    documents=[{
-                        "id": str(document.id),
-                        "text": extracted_text,
-                        "metadata": {
-                            "filename": file.filename,
-                            "document_id": document.id
-                        }
-                    }]
-                )
-                logger.info("Document ingested into vector store", document_id=document.id)
-            else:
-                logger.warning("PDF had no extractable text", document_id=document.id)
-
-        except Exception as e:
-            logger.error("RAG ingestion failed", document_id=document.id, error=str(e))
-
-        # ---------- NOTIFICATIONS ----------
-        await notify_document_upload(business, document.filename)
+        # The commit expired `business`; load its fields now so the
+        # notification task can read them after the session is closed
+        db.refresh(business)
+
+        # ---------- RAG INGESTION + NOTIFICATIONS (after the response) ----------
+        background_tasks.add_task(
+            ingest_uploaded_pdf, business_id, document.id, file_path, file.filename
+        )
+        background_tasks.add_task(notify_document_upload, business, document.filename)
 
         # ---------- RESPONSE ----------
         return DocumentResponse(
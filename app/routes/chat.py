@@ -3,9 +3,6 @@ Chat API: simple, safe wrapper around the one-node agent.
 """
 from __future__ import annotations
 
-import asyncio
-from functools import partial
-
 import structlog
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
@@ -48,20 +45,16 @@ def _ctx(b: Business):
     }
 
 
-async def _run_agent_async(bid: int, msg: str, ctx: dict):
-    loop = asyncio.get_event_loop()
-    fn = partial(run_agent, business_id=bid, user_message=msg, business_context=ctx)
-    return await loop.run_in_executor(None, fn)
-
-
 @router.post("/", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
     business = db.query(Business).filter(Business.id == request.business_id).first()
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
 
+    conversation_id = request.conversation_id
+
     # new lead on first msg
-    if not request.conversation_id:
+    if not conversation_id:
         lead = Lead(
             business_id=business.id,
             name=request.user_name,
@@ -70,11 +63,16 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
         )
         db.add(lead)
         db.commit()
+        conversation_id = f"conv_{business.id}_{lead.id}"
 
         await notify_new_lead(business, request.user_name, request.user_message)
 
     try:
-        agent_result = await _run_agent_async(business.id, request.user_message, _ctx(business))
+        agent_result = await run_agent(
+            business_id=business.id,
+            user_message=request.user_message,
+            business_context=_ctx(business),
+        )
         reply = agent_result.get("response") or "I’m here but having trouble answering. Try rephrasing?"
         tool_actions = agent_result.get("tool_actions", [])
     except Exception as exc:
@@ -87,7 +85,7 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
 
     return ChatResponse(
         reply=reply,
-        conversation_id=request.conversation_id or f"conv_{business.id}",
+        conversation_id=conversation_id,
         tool_actions=tool_actions,
         intent=None,
     )